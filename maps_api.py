@@ -1,21 +1,62 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Set
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.async_api import async_playwright, TimeoutError
+import asyncio
 import time
 import random
 from datetime import datetime
 import json
 from rich.console import Console
 import urllib.parse
+import re
 from maps_logger import setup_logger
-from concurrent.futures import ThreadPoolExecutor
-from itertools import cycle
 import uuid
+import os
+import functools
+from itertools import islice
+from cachetools import TLRUCache
 
 logger = setup_logger()
 console = Console()
-app = FastAPI(title="Maps Scraper API", version="1.0.0")
+app = FastAPI(title="Maps Scraper API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Number of Chromium instances kept alive between requests
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "4"))
+if BROWSER_POOL_SIZE < 1:
+    # An empty pool would leave every /scrape waiting forever for a browser
+    raise ValueError(f"BROWSER_POOL_SIZE must be at least 1, got {BROWSER_POOL_SIZE}")
+
+# Pages per search term that click through listings in parallel
+DETAIL_PAGES_PER_TERM = int(os.getenv("DETAIL_PAGES_PER_TERM", "3"))
+
+# Leads already scraped per (city, state, search terms), kept for six hours.
+# Values are (expires_at, rows) of (name, address, phone, search_term)
+# tuples; extending an entry keeps its original expiry, so no lead is
+# served past the TTL.
+SCRAPE_CACHE_TTL = 6 * 3600
+SCRAPE_CACHE = TLRUCache(maxsize=1024, ttu=lambda key, value, now: value[0], timer=time.monotonic)
+
+PHONE_RE = re.compile(r'\(?\d{3}[)\s.-]\s*\d{3}[\s.-]\d{4}')
+HAS_DIGIT_RE = re.compile(r'\d')
+SHOP_RE = re.compile(r'Tobacco shop|Smoke shop|Vaporizer store')
+STATUS_RE = re.compile(r'Open|Closes')
+# Card text is split into lines and "·"-separated fields. A field is only
+# taken as the street address when it is a house number followed by street
+# words ending in a street suffix; hours ("9 PM"), distances ("12 mi") and
+# counts ("2 locations") don't qualify, and an unsure card falls back to a
+# click.
+CARD_FIELD_SPLIT_RE = re.compile(r'[\n·⋅]')
+ADDRESS_RE = re.compile(
+    r'\d+[A-Za-z]?(?:-\d+)?\s+'
+    r'(?!(?:am|pm|mi|miles?|km|ft|feet|m|yrs?|years?|months?|hrs?|hours?|mins?|minutes?|locations?)\b)'
+    r'(?:[\w.\'-]+\s+){0,5}?'
+    r'(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Way|Pkwy|Parkway|'
+    r'Hwy|Highway|Fwy|Freeway|Expy|Expressway|Ct|Court|Pl|Place|Cir|Circle|Ter|Terrace|'
+    r'Trl|Trail|Loop|Sq|Square|Plaza|Pike|Row|Aly|Alley)\.?(?=$|[\s,#])',
+    re.IGNORECASE
+)
 
 class SearchRequest(BaseModel):
     city: str
@@ -25,6 +66,36 @@ class SearchRequest(BaseModel):
     existing_names: Optional[List[str]] = None
     existing_addresses: Optional[List[str]] = None
 
+class ResultColumns:
+    """Scraped leads stored as parallel per-field lists until the response is built"""
+    
+    def __init__(self):
+        self.names, self.addresses, self.phones, self.search_terms = [], [], [], []
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def append(self, name, address, phone, search_term):
+        self.names.append(name)
+        self.addresses.append(address)
+        self.phones.append(phone)
+        self.search_terms.append(search_term)
+    
+    def rows(self, start=0):
+        """Return (name, address, phone, search_term) tuples from index `start` on"""
+        return list(islice(zip(self.names, self.addresses, self.phones, self.search_terms), start, None))
+    
+    def truncate(self, size):
+        for column in (self.names, self.addresses, self.phones, self.search_terms):
+            del column[size:]
+    
+    def to_dicts(self):
+        return [
+            {'name': n, 'address': a, 'phone': p, 'website': '', 'search_term': t}
+            for n, a, p, t in zip(self.names, self.addresses, self.phones, self.search_terms)
+        ]
+
+@functools.lru_cache(maxsize=256)
 def get_search_url(term, city, state):
     """Generate direct Google Maps search URL for specific city/state"""
     # Encode the search term and location separately
@@ -33,27 +104,88 @@ def get_search_url(term, city, state):
     # Use a simpler URL format that's more reliable
     return f"https://www.google.com/maps/search/{query}+near+{location}"
 
-def extract_business_info(page, listing):
-    """Extract business information from a listing element"""
+def _norm(s):
+    """Normalize a name or address for duplicate checks"""
+    # Maps text drifts in case, whitespace and "·" separators (sometimes
+    # mis-decoded as "Â·")
+    s = s.lower().replace('â·', '').replace('·', '')
+    return re.sub(r'\s+', ' ', s).strip()
+
+def _norm_address(address):
+    """Normalize an address to its street part for duplicate checks"""
+    # Cards only show the street while the details panel and callers' lists
+    # have the full "street, city, state zip" address
+    return _norm(address.split(',')[0])
+
+# Requests the scraper never reads; XHR, fetch, documents and scripts still
+# load so the results panel renders
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_URL_PARTS = ("google-analytics", "doubleclick")
+
+async def block_unused_resources(route):
+    """Abort images, fonts, media, stylesheets and analytics beacons"""
+    request = route.request
+    if (request.resource_type in BLOCKED_RESOURCE_TYPES or
+        any(part in request.url for part in BLOCKED_URL_PARTS)):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Collects the text of every result card from index `start` on in a single
+# round-trip to the browser
+CARD_SCRIPT = """
+    (start) => Array.from(document.querySelectorAll('.Nv2PK')).slice(start).map(el => ({
+        name: el.querySelector('.qBF1Pd')?.innerText || '',
+        text: el.innerText
+    }))
+"""
+
+def parse_card(card):
+    """Return (name, address, phone) from a batched result card payload"""
+    name = card['name']
+    if not name or 'cigar' in name.lower():
+        return None
+    
+    text = card['text']
+    phone_match = PHONE_RE.search(text)
+    phone = phone_match.group(0) if phone_match else ""
+    
+    # Skip the name line so names like "7 Star Smoke Shop" aren't addresses
+    fields = (field.strip() for field in CARD_FIELD_SPLIT_RE.split(text))
+    address = next((field for field in fields if field != name and ADDRESS_RE.match(field)), "")
+    
+    return name, address, phone
+
+async def extract_business_info(page, listing, known_names, should_stop):
+    """Return (name, address, phone) for a listing locator, skipping known names"""
     try:
-        # Add initial wait for stability
-        time.sleep(0.5)
-        
         name = ""
-        name_el = listing.query_selector('.qBF1Pd')
-        if name_el:
-            name = name_el.inner_text()
+        names = await listing.locator('.qBF1Pd').all_inner_texts()
+        if names:
+            name = names[0]
             
-            if 'cigar' in name.lower():
+            if 'cigar' in name.lower() or _norm(name) in known_names:
                 return None
         
+        # Without a name the panel can't be matched to this listing
+        if not name:
+            return None
+        
         address = ""
         phone = ""
         
         try:
             # Add more robust clicking
-            listing.click(timeout=2000)
-            time.sleep(1)  # Increased wait time
+            await listing.click(timeout=2000)
+            
+            # The previous listing's panel stays visible until Maps re-renders
+            # it, so wait for the heading to show this listing before reading
+            # any fields
+            await page.wait_for_function(
+                "name => document.querySelector('h1.DUwDvf')?.innerText.trim() === name",
+                arg=name.strip(),
+                timeout=2500
+            )
             
             # Try multiple selectors for address
             address_selectors = [
@@ -62,14 +194,15 @@ def extract_business_info(page, listing):
                 '.rogA2c'
             ]
             
-            for selector in address_selectors:
-                try:
-                    address_el = page.wait_for_selector(selector, timeout=2000, state='visible')
-                    if address_el:
-                        address = address_el.inner_text().strip()
-                        break
-                except:
-                    continue
+            # Race all selectors in one wait; the address is ready as soon as
+            # any of them is visible. A timeout drops to the fallback.
+            address_el = await page.wait_for_selector(", ".join(address_selectors), timeout=2500, state='visible')
+            if address_el:
+                address = (await address_el.inner_text()).strip()
+            
+            # Other workers may have reached num_leads while the panel loaded
+            if should_stop():
+                return None
             
             # Try multiple selectors for phone
             phone_selectors = [
@@ -78,44 +211,33 @@ def extract_business_info(page, listing):
                 '.rogA2c span.UsdlK'
             ]
             
-            for selector in phone_selectors:
-                try:
-                    phone_el = page.wait_for_selector(selector, timeout=2000, state='visible')
-                    if phone_el:
-                        phone = phone_el.inner_text().strip()
-                        break
-                except:
-                    continue
+            try:
+                phone_el = await page.wait_for_selector(", ".join(phone_selectors), timeout=2500, state='visible')
+                if phone_el:
+                    phone = (await phone_el.inner_text()).strip()
+            except TimeoutError:
+                pass
 
         except Exception as e:
             logger.warning(f"Error clicking listing or extracting details: {str(e)}")
-            # Fallback method remains the same...
-            info_containers = listing.query_selector_all('.W4Efsd')
-            for container in info_containers:
-                container_text = container.inner_text()
-                
-                if not address and ('Tobacco shop' in container_text or 'Smoke shop' in container_text or 'Vaporizer store' in container_text):
-                    spans = container.query_selector_all('span')
-                    for span in spans:
-                        span_text = span.inner_text().strip()
-                        if any(char.isdigit() for char in span_text) and not span_text.startswith('('):
-                            address = span_text.replace('·', '').strip()
-                            break
-                
-                if not phone and ('Open' in container_text or 'Closes' in container_text):
-                    phone_el = container.query_selector('span.UsdlK')
-                    if phone_el:
-                        phone = phone_el.inner_text().strip()
+            # Fallback to the card text, read with one call per selector
+            container_texts = await listing.locator('.W4Efsd').all_inner_texts()
+            
+            if not address and any(SHOP_RE.search(container_text) for container_text in container_texts):
+                for span_text in await listing.locator('.W4Efsd span').all_inner_texts():
+                    span_text = span_text.strip()
+                    if HAS_DIGIT_RE.search(span_text) and not span_text.startswith('('):
+                        address = span_text.replace('·', '').strip()
+                        break
+            
+            if not phone and any(STATUS_RE.search(container_text) for container_text in container_texts):
+                phones = await listing.locator('.W4Efsd span.UsdlK').all_inner_texts()
+                if phones:
+                    phone = phones[0].strip()
 
         # Only return results if we have both a name and a phone number
         if name and phone:
-            result = {
-                'name': name,
-                'address': address,
-                'phone': phone,
-                'website': ''
-            }
-            return result
+            return name, address, phone
             
         return None
 
@@ -123,125 +245,298 @@ def extract_business_info(page, listing):
         logger.error(f"Error extracting business info: {str(e)}")
         return None
 
-def load_more_results(page):
-    """Optimized version of loading more results"""
-    try:
-        initial_results = len(page.query_selector_all('.Nv2PK'))
+# Scrolls the results panel and resolves true as soon as a MutationObserver
+# sees new result cards attach, or false after `timeout` ms
+LOAD_MORE_SCRIPT = """
+    (timeout) => new Promise(resolve => {
+        const before = document.querySelectorAll('.Nv2PK').length;
+        const panel = document.querySelector('.DxyBCb');
+        if (!panel) return resolve(false);
         
-        # Scroll the results panel
-        page.evaluate("""
-            const panel = document.querySelector('.DxyBCb');
-            if (panel) {
-                panel.scrollTo({
-                    top: panel.scrollHeight,
-                    behavior: 'smooth'
-                });
+        const obs = new MutationObserver(() => {
+            if (document.querySelectorAll('.Nv2PK').length > before) {
+                obs.disconnect();
+                clearTimeout(timer);
+                resolve(true);
             }
-        """)
-        
-        # Wait briefly for new results to load
-        time.sleep(0.3)
-        
-        new_results = len(page.query_selector_all('.Nv2PK'))
-        return new_results > initial_results
+        });
+        const timer = setTimeout(() => {
+            obs.disconnect();
+            resolve(false);
+        }, timeout);
+        obs.observe(panel, {childList: true, subtree: true});
+        panel.scrollTo({top: panel.scrollHeight});
+    })
+"""
+
+async def load_more_results(page):
+    """Scroll the results panel and wait for new result cards to attach"""
+    try:
+        # A false result means no new cards arrived, i.e. the list is exhausted
+        return await page.evaluate(LOAD_MORE_SCRIPT, 2500)
         
     except Exception as e:
         logger.error(f"Error while scrolling: {str(e)}")
         return False
 
+async def open_results_page(context, search_url):
+    """Open a page on the search results and wait for the first result card"""
+    page = await context.new_page()
+    try:
+        # Maps never goes network-idle; the first result card is the real
+        # readiness signal
+        await page.goto(search_url, wait_until='commit')
+        await page.wait_for_selector('.Nv2PK', timeout=15000)
+    except Exception:
+        await page.close()
+        raise
+    return page
+
+# Card names in page order, used to find a queued listing on a detail page
+CARD_NAMES_SCRIPT = """
+    () => Array.from(document.querySelectorAll('.Nv2PK')).map(
+        el => el.querySelector('.qBF1Pd')?.innerText || ''
+    )
+"""
+
+# How far a listing may have moved on a reloaded results page, e.g. when
+# sponsored entries are inserted
+LISTING_SEARCH_WINDOW = 5
+
+def find_listing_index(names, index, name):
+    """Return the index nearest to `index` whose card is named `name`, or None"""
+    nearby = range(max(0, index - LISTING_SEARCH_WINDOW), min(len(names), index + LISTING_SEARCH_WINDOW + 1))
+    matches = [i for i in nearby if names[i] == name]
+    return min(matches, key=lambda i: abs(i - index)) if matches else None
+
+async def extract_details(page, listings, request, all_results, existing_names, add_result):
+    """Click through the queued (index, name) listings on one page, in order"""
+    result_items = page.locator('.Nv2PK')
+    for index, name in listings:
+        if len(all_results) >= request.num_leads:
+            break
+        
+        # Extra detail pages load their own result list, which Maps may order
+        # differently, so match the card by name and scroll until the window
+        # around its original index has loaded
+        while True:
+            names = await page.evaluate(CARD_NAMES_SCRIPT)
+            match = find_listing_index(names, index, name)
+            if match is not None or len(names) > index + LISTING_SEARCH_WINDOW:
+                break
+            if not await load_more_results(page):
+                break
+        
+        if match is None:
+            logger.warning(f"Listing not found on detail page: {name}")
+            continue
+        
+        # Another worker may have found this business since it was queued
+        add_result(await extract_business_info(
+            page, result_items.nth(match), existing_names,
+            should_stop=lambda: len(all_results) >= request.num_leads
+        ))
+        await asyncio.sleep(0.1)
+
+async def scrape_term(context, term, request, all_results, processed_addresses, existing_names):
+    """Scrape one search term in its own pages of the request's browser context"""
+    search_url = get_search_url(term, request.city, request.state)
+    logger.info(f"Searching for {term} in {request.city}, {request.state}")
+    try:
+        page = await open_results_page(context, search_url)
+    except TimeoutError:
+        logger.warning(f"No results found for term: {term}")
+        return
+    detail_pages = [page]
+    
+    # Terms share the result list and dedup sets; tasks only interleave at
+    # awaits, so the check-and-add below needs no lock
+    def add_result(lead):
+        if not lead:
+            return
+        name, address, phone = lead
+        if (phone and address and 
+            len(all_results) < request.num_leads and 
+            _norm_address(address) not in processed_addresses and 
+            _norm(name) not in existing_names):
+            
+            processed_addresses.add(_norm_address(address))
+            existing_names.add(_norm(name))
+            all_results.append(name, address, phone, term)
+            logger.info(f"Found business: {name}")
+    
+    async def process_cards(cards, start):
+        pending = []
+        for index, card in enumerate(cards, start=start):
+            lead = parse_card(card)
+            if not lead:
+                continue
+            name, address, phone = lead
+            # Only open the details panel when the card lacks a phone or
+            # address and isn't a business we already have
+            if not (phone and address):
+                if _norm(name) not in existing_names:
+                    pending.append((index, name))
+            else:
+                add_result(lead)
+        
+        if not pending or len(all_results) >= request.num_leads:
+            return
+        
+        # Spread the detail clicks over up to DETAIL_PAGES_PER_TERM pages,
+        # opening the extra ones the first time they're needed
+        missing = min(DETAIL_PAGES_PER_TERM, len(pending)) - len(detail_pages)
+        if missing > 0:
+            opened = await asyncio.gather(
+                *[open_results_page(context, search_url) for _ in range(missing)],
+                return_exceptions=True
+            )
+            detail_pages.extend(p for p in opened if not isinstance(p, Exception))
+        
+        # Let every worker finish before the term's pages can be closed; a
+        # failing page only loses its own share of listings
+        outcomes = await asyncio.gather(*[
+            extract_details(detail_page, pending[k::len(detail_pages)], request, all_results, existing_names, add_result)
+            for k, detail_page in enumerate(detail_pages)
+        ], return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.warning(f"Error extracting details for {term}: {str(outcome)}")
+    
+    try:
+        # Process results from this page immediately
+        processed_count = 0
+        cards = await page.evaluate(CARD_SCRIPT, processed_count)
+        await process_cards(cards, processed_count)
+        processed_count += len(cards)
+
+        # Only try to load more if we still need results
+        while len(all_results) < request.num_leads:
+            if not await load_more_results(page):
+                break
+            
+            # Scrolling only appends cards, so skip the ones already handled
+            new_cards = await page.evaluate(CARD_SCRIPT, processed_count)
+            await process_cards(new_cards, processed_count)
+            processed_count += len(new_cards)
+
+    finally:
+        for detail_page in detail_pages:
+            await detail_page.close()
+
+@app.on_event("startup")
+async def start_browser_pool():
+    """Launch the pooled browsers once for the lifetime of the app"""
+    app.state.playwright = await async_playwright().start()
+    app.state.browser_pool = asyncio.Queue()
+    for _ in range(BROWSER_POOL_SIZE):
+        browser = await app.state.playwright.chromium.launch(headless=True)
+        app.state.browser_pool.put_nowait(browser)
+    logger.info(f"Browser pool started with {BROWSER_POOL_SIZE} browsers")
+
+@app.on_event("shutdown")
+async def stop_browser_pool():
+    """Close the pooled browsers and stop Playwright"""
+    while not app.state.browser_pool.empty():
+        browser = app.state.browser_pool.get_nowait()
+        await browser.close()
+    await app.state.playwright.stop()
+    logger.info("Browser pool stopped")
+
+async def replace_if_disconnected(browser):
+    """Return `browser`, or a freshly launched one if it crashed or disconnected"""
+    if browser.is_connected():
+        return browser
+    logger.warning("Pooled browser disconnected, launching a replacement")
+    return await app.state.playwright.chromium.launch(headless=True)
+
+async def release_browser(browser):
+    """Put a browser back in the pool, replacing it first if it has died"""
+    try:
+        browser = await replace_if_disconnected(browser)
+    except Exception as e:
+        # Keep the pool at full size; the next checkout retries the launch
+        logger.error(f"Error replacing pooled browser: {str(e)}")
+    app.state.browser_pool.put_nowait(browser)
+
 @app.post("/scrape")
-def scrape_locations(request: SearchRequest):
-    """Modified scraping endpoint with concurrent browser contexts"""
+async def scrape_locations(request: SearchRequest):
+    """Scraping endpoint running one concurrent page per search term"""
     logger.info(f"Starting scrape for {request.city}, {request.state}")
     
-    all_results = []
-    processed_addresses = set(request.existing_addresses or [])
-    existing_names = set(request.existing_names or [])
+    cache_key = (request.city.lower(), request.state.lower(), tuple(sorted(request.search_terms)))
+    _, cached = SCRAPE_CACHE.get(cache_key, (None, []))
+    
+    all_results = ResultColumns()
+    processed_addresses = {_norm_address(a) for a in (request.existing_addresses or [])}
+    existing_names = {_norm(n) for n in (request.existing_names or [])}
 
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            logger.info("Browser launched successfully")
+    # Start from earlier leads for the same search the caller doesn't have yet
+    for name, address, phone, search_term in cached:
+        if (_norm_address(address) not in processed_addresses and 
+            _norm(name) not in existing_names):
+            
+            processed_addresses.add(_norm_address(address))
+            existing_names.add(_norm(name))
+            all_results.append(name, address, phone, search_term)
+    cached_count = len(all_results)
+
+    if cached_count >= request.num_leads:
+        logger.info(f"Serving {request.num_leads} cached leads for {request.city}, {request.state}")
+    else:
+        # Waits here when every pooled browser is busy with another request
+        browser = await app.state.browser_pool.get()
+        context = None
+        try:
+            browser = await replace_if_disconnected(browser)
             
-            # Create multiple browser contexts
-            contexts = []
-            pages = []
+            # One fresh context per request keeps callers isolated; its
+            # search terms share it
+            context = await browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/96.0.0.0'
+            )
+            await context.route("**/*", block_unused_resources)
             
-            # Only create contexts/pages until we have enough results
-            for i, term in enumerate(request.search_terms):
-                if len(all_results) >= request.num_leads:
-                    break
-                    
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent=f'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/96.0.{i}.0'
-                )
-                contexts.append(context)
-                
-                page = context.new_page()
-                pages.append(page)
-                
-                search_url = get_search_url(term, request.city, request.state)
-                logger.info(f"Searching for {term} in {request.city}, {request.state}")
-                page.goto(search_url, wait_until='networkidle')
-                time.sleep(2)
-                
-                # Process results from this page immediately
-                result_items = page.query_selector_all('.Nv2PK')
-                if not result_items:
-                    logger.warning(f"No results found for term: {term}")
-                    continue
-
-                for item in result_items:
-                    if len(all_results) >= request.num_leads:
-                        break
-                        
-                    info = extract_business_info(page, item)
-                    if (info and info['address'] and 
-                        info['address'] not in processed_addresses and 
-                        info['name'] not in existing_names):
-                        
-                        processed_addresses.add(info['address'])
-                        existing_names.add(info['name'])
-                        info['search_term'] = term
-                        all_results.append(info)
-                        logger.info(f"Found business: {info['name']}")
-                    
-                    time.sleep(0.1)
-
-                # Only try to load more if we still need results
-                while len(all_results) < request.num_leads:
-                    if not load_more_results(page):
-                        break
-                    
-                    new_items = page.query_selector_all('.Nv2PK')
-                    for item in new_items:
-                        if len(all_results) >= request.num_leads:
-                            break
-                            
-                        info = extract_business_info(page, item)
-                        if (info and info['address'] and 
-                            info['address'] not in processed_addresses and 
-                            info['name'] not in existing_names):
-                            
-                            processed_addresses.add(info['address'])
-                            existing_names.add(info['name'])
-                            info['search_term'] = term
-                            all_results.append(info)
-                            logger.info(f"Found business: {info['name']}")
-                        
-                        time.sleep(0.1)
-
-            # Cleanup
-            for page in pages:
-                page.close()
-            for context in contexts:
-                context.close()
-            browser.close()
+            # return_exceptions lets every term finish before the context is
+            # closed, and keeps one failing term from discarding the others
+            outcomes = await asyncio.gather(*[
+                scrape_term(context, term, request, all_results, processed_addresses, existing_names)
+                for term in request.search_terms
+            ], return_exceptions=True)
 
-    except Exception as e:
-        logger.error(f"Error during scraping: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error during scraping: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            if context:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser context: {str(e)}")
+            await release_browser(browser)
+
+        term_errors = []
+        for term, outcome in zip(request.search_terms, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error scraping term {term}: {str(outcome)}", exc_info=outcome)
+                term_errors.append(outcome)
+
+        # Only fail the request when no term produced anything
+        if term_errors and not all_results:
+            raise HTTPException(status_code=500, detail=str(term_errors[0]))
+
+        if len(all_results) > cached_count:
+            # Re-read the entry: another request may have extended it while
+            # this one was scraping
+            expires_at, rows = SCRAPE_CACHE.get(cache_key, (time.monotonic() + SCRAPE_CACHE_TTL, []))
+            known_addresses = {_norm_address(row[1]) for row in rows}
+            new_rows = [row for row in all_results.rows(cached_count)
+                        if _norm_address(row[1]) not in known_addresses]
+            SCRAPE_CACHE[cache_key] = (expires_at, rows + new_rows)
+
+    # Cached leads alone can exceed num_leads
+    all_results.truncate(request.num_leads)
 
     if not all_results:
         logger.warning("No results found for the search criteria")
@@ -254,7 +549,7 @@ def scrape_locations(request: SearchRequest):
             "state": request.state
         },
         "total_leads": len(all_results),
-        "results": all_results
+        "results": all_results.to_dicts()
     }
 
 @app.get("/health")
@@ -264,7 +559,7 @@ def health_check():
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    request_id = str(uuid.uuid4())
+    request_id = uuid.uuid4().hex
     logger.info(f"Request {request_id} started - {request.method} {request.url.path}")
     start_time = time.time()
     response = await call_next(request)